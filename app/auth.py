@@ -1,34 +1,95 @@
 """Authentication utilities for the FastAPI service."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from typing import Dict, Optional
-
+import calendar
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import bcrypt
+import orjson
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import JWTError, jwk, jwt
+from jose.utils import base64url_encode
 
 from .config import Settings, get_settings
 from .models import Token, TokenData, User, UserInDB
 
+# bcrypt (cost 12) hash of the demo password "changeme", precomputed to keep import cheap
+_DEMO_HASH = "$2b$12$oCASA.bYXxqAaQPoxSLY5OXJbCJpgsuMLgcc8q0FfkxnAV1DOgZNi"
+
 # Demo user store; production systems should use a proper database
 _FAKE_USERS_DB: Dict[str, UserInDB] = {
     "data.engineer": UserInDB(
         username="data.engineer",
         full_name="Data Engineer",
-        hashed_password=CryptContext(schemes=["bcrypt"]).hash("changeme"),
+        hashed_password=_DEMO_HASH,
     )
 }
 
 _oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Bounded LRU of successful bcrypt verifications keyed on (hash, sha256(password));
+# plaintext passwords are never stored, and a changed password gets a new key. Failures
+# are not cached, so wrong guesses always pay the full bcrypt cost and cannot evict real
+# entries.
+_VERIFY_CACHE_MAXSIZE = 4096
+_VERIFY_CACHE: "OrderedDict[Tuple[str, bytes], None]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hashed password."""
 
-    return _pwd_context.verify(plain_password, hashed_password)
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hashed password, reusing cached successes."""
+
+    key = (hashed_password, hashlib.sha256(plain_password.encode()).digest())
+    with _verify_cache_lock:
+        if key in _VERIFY_CACHE:
+            _VERIFY_CACHE.move_to_end(key)
+            return True
+    if not bcrypt.checkpw(plain_password.encode(), hashed_password.encode()):
+        return False
+    with _verify_cache_lock:
+        _VERIFY_CACHE[key] = None
+        if len(_VERIFY_CACHE) > _VERIFY_CACHE_MAXSIZE:
+            _VERIFY_CACHE.popitem(last=False)
+    return True
+
+
+# Decoded (signature-verified) JWT payloads keyed on (token, secret, algorithm), kept
+# until expiry; keying on the signing settings stops a rotated secret honouring old tokens
+_JWT_CACHE_MAXSIZE = 8192
+_JWT_CACHE: "OrderedDict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_jwt_cache_lock = threading.Lock()
+
+
+def _decode_token(token: str, settings: Settings) -> Dict[str, Any]:
+    """Decode a JWT, serving copies of previously verified payloads from the cache."""
+
+    key = (token, settings.jwt_secret_key, settings.jwt_algorithm)
+    now = time.time()
+    with _jwt_cache_lock:
+        cached = _JWT_CACHE.get(key)
+        if cached is not None:
+            expires_at, payload = cached
+            if expires_at > now:
+                _JWT_CACHE.move_to_end(key)
+                return dict(payload)
+            del _JWT_CACHE[key]
+
+    payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+    exp = payload.get("exp")
+    if exp is None:
+        return payload
+    with _jwt_cache_lock:
+        _JWT_CACHE[key] = (float(exp), dict(payload))
+        if len(_JWT_CACHE) > _JWT_CACHE_MAXSIZE:
+            _JWT_CACHE.popitem(last=False)
+    return payload
 
 
 def get_user(username: str) -> Optional[UserInDB]:
@@ -41,18 +102,38 @@ def authenticate_user(username: str, password: str) -> Optional[UserInDB]:
     """Authenticate username/password and return the user if valid."""
 
     user = get_user(username)
-    if user is None or not verify_password(password, user.hashed_password):
+    if user is None:
+        # Burn an uncached bcrypt verify so unknown users and wrong passwords take equal time
+        bcrypt.checkpw(password.encode(), _DEMO_HASH.encode())
+        return None
+    if not verify_password(password, user.hashed_password):
         return None
     return user
 
 
+@lru_cache
+def _signing_key(secret_key: str, algorithm: str) -> Tuple[bytes, Any]:
+    """Return the encoded JWT header and constructed signing key for a secret/algorithm."""
+
+    header = base64url_encode(orjson.dumps({"alg": algorithm, "typ": "JWT"}))
+    return header, jwk.construct(secret_key, algorithm)
+
+
 def create_access_token(data: dict, settings: Settings) -> str:
     """Create a signed JWT access token."""
 
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    # Registered time claims must be epoch ints, as jose.jwt.encode would emit them
+    for claim in ("exp", "iat", "nbf"):
+        value = to_encode.get(claim)
+        if isinstance(value, datetime):
+            to_encode[claim] = calendar.timegm(value.utctimetuple())
+    header, key = _signing_key(settings.jwt_secret_key, settings.jwt_algorithm)
+    signing_input = header + b"." + base64url_encode(orjson.dumps(to_encode))
+    signature = base64url_encode(key.sign(signing_input))
+    return (signing_input + b"." + signature).decode("ascii")
 
 
 async def login_for_access_token(
@@ -84,7 +165,7 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        payload = _decode_token(token, settings)
         username: Optional[str] = payload.get("sub")
         if username is None:
             raise credentials_exception
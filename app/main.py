@@ -1,6 +1,7 @@
 """Main FastAPI application exposing secured ingestion endpoints."""
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 from typing import Any, Dict
 
@@ -8,6 +9,7 @@ import duckdb
 import structlog
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from opentelemetry import trace
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.sdk.resources import SERVICE_NAME, Resource
@@ -20,7 +22,7 @@ from .models import IngestionPayload, IngestionResponse, User
 
 logger = structlog.get_logger()
 
-app = FastAPI(title="Modern Data Platform API")
+app = FastAPI(title="Modern Data Platform API", default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -51,18 +53,54 @@ async def login(token: Token = Depends(login_for_access_token)) -> Token:
     return token
 
 
+_INSERT_METRIC_SQL = "insert into metrics values (?, ?, ?, ?)"
+
+
+def _create_metrics_table(conn: duckdb.DuckDBPyConnection) -> None:
+    conn.execute(
+        """
+        create table if not exists metrics (
+            source varchar,
+            metric varchar,
+            value double,
+            timestamp timestamp
+        )
+        """
+    )
+
+
 def _ensure_warehouse(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with duckdb.connect(str(path)) as conn:
+        _create_metrics_table(conn)
+
+
+@app.on_event("startup")
+async def _init_warehouse() -> None:
+    """Create the warehouse directory and metrics table once at startup."""
+
+    _ensure_warehouse(Path(get_settings().duckdb_path))
+    logger.info("warehouse.initialized")
+
+
+def _insert_metric(path: Path, row: Dict[str, Any]) -> None:
+    """Write a single metric row; runs on a worker thread to keep the event loop free.
+
+    The connection is short-lived so the DuckDB file lock is only held for the write,
+    leaving the warehouse available to the ETL flow, Celery workers and dashboard.
+    The idempotent DDL rides on the same connection so a recreated file still works.
+    """
+
+    with duckdb.connect(str(path)) as conn:
+        _create_metrics_table(conn)
         conn.execute(
-            """
-            create table if not exists metrics (
-                source varchar,
-                metric varchar,
-                value double,
-                timestamp timestamp
-            )
-            """
+            _INSERT_METRIC_SQL,
+            (
+                row["source"],
+                row["metric"],
+                row["value"],
+                row["timestamp"],
+            ),
         )
 
 
@@ -74,20 +112,11 @@ async def ingest(
 ) -> IngestionResponse:
     """Persist metrics into DuckDB and return metadata about the operation."""
 
-    logger.info("ingest.request", user=user.username, **payload.model_dump())
+    payload_dict = payload.model_dump()
+    logger.info("ingest.request", user=user.username, **payload_dict)
     db_path = Path(settings.duckdb_path)
-    _ensure_warehouse(db_path)
 
-    with duckdb.connect(str(db_path)) as conn:
-        conn.execute(
-            "insert into metrics values (?, ?, ?, ?)",
-            (
-                payload.source,
-                payload.metric,
-                payload.value,
-                payload.timestamp,
-            ),
-        )
+    await asyncio.to_thread(_insert_metric, db_path, payload_dict)
     logger.info("ingest.persisted", warehouse=str(db_path))
     return IngestionResponse(rows_ingested=1, warehouse_path=str(db_path))
 
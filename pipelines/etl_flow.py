@@ -1,9 +1,9 @@
 """Prefect flow orchestrating data ingestion from a public API."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List
+from typing import List
 
 import duckdb
 import httpx
@@ -23,6 +23,8 @@ def fetch_prices() -> pd.DataFrame:
     response = httpx.get(API_URL, timeout=10.0)
     response.raise_for_status()
     payload = response.json()
+    # Naive UTC to match the TIMESTAMP column; shared by every row of this fetch
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
     rows: List[dict] = []
     for currency, metadata in payload["bpi"].items():
         rows.append(
@@ -30,7 +32,7 @@ def fetch_prices() -> pd.DataFrame:
                 "source": "coindesk",
                 "metric": f"btc_price_{currency.lower()}",
                 "value": float(metadata["rate_float"]),
-                "timestamp": datetime.utcnow(),
+                "timestamp": now,
             }
         )
     return pd.DataFrame(rows)
@@ -54,21 +56,14 @@ def persist(df: pd.DataFrame) -> int:
             )
             """
         )
-        conn.executemany(
-            "insert into metrics values (?, ?, ?, ?)",
-            cast_to_records(df.to_dict(orient="records")),
-        )
+        if df.empty:
+            # The appender rejects a frame with no columns; nothing to write anyway
+            return 0
+        # by_name is missing from the type stubs of early duckdb 0.10 releases
+        conn.append("metrics", df, by_name=True)  # type: ignore[call-arg, unused-ignore]
     return len(df)
 
 
-def cast_to_records(rows: Iterable[dict]) -> List[tuple]:
-    """Convert DataFrame rows into tuples for DuckDB ingestion."""
-
-    return [
-        (row["source"], row["metric"], float(row["value"]), row["timestamp"]) for row in rows
-    ]
-
-
 @flow(name="bitcoin-price-etl")
 def etl_flow() -> int:
     """End-to-end orchestration of the ETL job."""
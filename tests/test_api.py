@@ -1,23 +1,28 @@
 """Tests for the FastAPI ingestion workflow."""
 from __future__ import annotations
 
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Dict, Iterator, List
 
 import duckdb
 import pytest
 from fastapi.testclient import TestClient
+from jose import JWTError, jwt
 
-from app.auth import _FAKE_USERS_DB, create_access_token
-from app.config import Settings
+from app import auth
+from app.auth import _FAKE_USERS_DB, _decode_token, authenticate_user, create_access_token
+from app.config import Settings, get_settings
 from app.main import app
 from app.models import IngestionPayload
 
 
 @pytest.fixture(autouse=True)
-def _reset_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+def _reset_db(tmp_path: Path) -> Iterator[None]:
     settings = Settings(duckdb_path=str(tmp_path / "warehouse.duckdb"))
-    monkeypatch.setattr("app.config.get_settings", lambda: settings)
+    # Endpoints resolve settings through Depends(get_settings), so override the dependency
+    app.dependency_overrides[get_settings] = lambda: settings
     Path(settings.duckdb_path).parent.mkdir(parents=True, exist_ok=True)
     with duckdb.connect(settings.duckdb_path) as conn:
         conn.execute(
@@ -30,6 +35,8 @@ def _reset_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
             )
             """
         )
+    yield
+    app.dependency_overrides.clear()
 
 
 def _token(settings: Settings) -> str:
@@ -44,17 +51,16 @@ def test_healthcheck() -> None:
     assert response.json()["status"] == "ok"
 
 
-def test_ingest_flow(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+def test_ingest_flow(tmp_path: Path) -> None:
     settings = Settings(duckdb_path=str(tmp_path / "warehouse.duckdb"))
-    monkeypatch.setattr("app.config.get_settings", lambda: settings)
 
     payload = IngestionPayload(source="pytest", metric="unit", value=1.23, timestamp=datetime.utcnow())
     client = TestClient(app)
     token = _token(settings)
     response = client.post(
         "/ingest",
-        json=payload.model_dump(),
-        headers={"Authorization": f"Bearer {token}"},
+        content=payload.model_dump_json(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
     )
     assert response.status_code == 200
     body = response.json()
@@ -65,3 +71,99 @@ def test_ingest_flow(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         row = conn.execute("select * from metrics").fetchone()
     assert row[0] == payload.source
     assert row[1] == payload.metric
+
+
+def _spy_checkpw(monkeypatch: pytest.MonkeyPatch) -> List[bytes]:
+    calls: List[bytes] = []
+    checkpw = auth.bcrypt.checkpw
+
+    def _spy(password: bytes, hashed: bytes) -> bool:
+        calls.append(hashed)
+        return checkpw(password, hashed)
+
+    monkeypatch.setattr(auth.bcrypt, "checkpw", _spy)
+    monkeypatch.setattr(auth, "_VERIFY_CACHE", OrderedDict())
+    return calls
+
+
+def test_unknown_user_pays_bcrypt_cost(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _spy_checkpw(monkeypatch)
+    username = next(iter(_FAKE_USERS_DB))
+    for _ in range(2):
+        assert authenticate_user("nobody", "changeme") is None
+        assert authenticate_user(username, "wrong-password") is None
+    assert len(calls) == 4
+
+
+def test_repeat_login_skips_bcrypt(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _spy_checkpw(monkeypatch)
+    username = next(iter(_FAKE_USERS_DB))
+    for _ in range(2):
+        assert authenticate_user(username, "changeme") is not None
+    assert len(calls) == 1
+
+
+def _spy_jwt_decode(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    calls: List[str] = []
+    decode = auth.jwt.decode
+
+    def _spy(token: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        calls.append(token)
+        return decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", _spy)
+    monkeypatch.setattr(auth, "_JWT_CACHE", OrderedDict())
+    return calls
+
+
+def test_token_cache_hit_skips_decode(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _spy_jwt_decode(monkeypatch)
+    settings = Settings()
+    token = _token(settings)
+
+    first = _decode_token(token, settings)
+    first["sub"] = "mallory"
+    second = _decode_token(token, settings)
+    second["sub"] = "mallory"
+    third = _decode_token(token, settings)
+
+    assert len(calls) == 1
+    assert third["sub"] == next(iter(_FAKE_USERS_DB))
+
+
+def test_token_cache_drops_expired_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _spy_jwt_decode(monkeypatch)
+    settings = Settings()
+    token = _token(settings)
+    _decode_token(token, settings)
+
+    expires_at = auth._JWT_CACHE[(token, settings.jwt_secret_key, settings.jwt_algorithm)][0]
+    monkeypatch.setattr(auth.time, "time", lambda: expires_at + 1)
+    _decode_token(token, settings)
+    assert len(calls) == 2
+
+
+def test_token_cache_rejects_after_secret_change(monkeypatch: pytest.MonkeyPatch) -> None:
+    _spy_jwt_decode(monkeypatch)
+    settings = Settings()
+    token = _token(settings)
+    _decode_token(token, settings)
+
+    with pytest.raises(JWTError):
+        _decode_token(token, Settings(jwt_secret_key="rotated-secret"))
+
+
+def test_access_token_decodes_with_jose() -> None:
+    settings = Settings()
+    issued = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    token = create_access_token({"sub": "data.engineer", "iat": issued}, settings)
+
+    claims = jwt.decode(
+        token,
+        settings.jwt_secret_key,
+        algorithms=[settings.jwt_algorithm],
+        options={"verify_iat": False},
+    )
+    assert claims["sub"] == "data.engineer"
+    assert isinstance(claims["exp"], int)
+    assert claims["iat"] == int(issued.timestamp())
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+from typing import Any, Dict, List, Optional, Tuple
 
 from celery import Celery
 
@@ -24,30 +25,50 @@ celery_app.conf.update(
 )
 
 
-@celery_app.task(name="reports.generate_summary")
-def generate_summary(metric: str) -> dict:
-    """Compute basic aggregates for a metric stored in DuckDB."""
+def _summarize(metric: str, result: Optional[Tuple[Any, ...]]) -> Dict[str, Any]:
+    """Shape a grouped DuckDB row into the task result payload."""
+
+    if result is None:
+        return {"metric": metric, "records": 0, "average": None, "last_seen": None}
+    return {
+        "metric": result[0],
+        "records": int(result[1]),
+        "average": float(result[2]),
+        "last_seen": result[3].isoformat() if result[3] else None,
+    }
+
+
+def _summaries(metrics: List[str]) -> List[Dict[str, Any]]:
+    """Compute aggregates for the given metrics in a single DuckDB query."""
 
     from pathlib import Path
 
     import duckdb
 
     path = Path(settings.duckdb_path)
-    with duckdb.connect(str(path)) as conn:
-        result = conn.execute(
+    with duckdb.connect(str(path), read_only=True) as conn:
+        rows = conn.execute(
             """
             select metric, count(*) as records, avg(value) as average, max(timestamp) as last_seen
             from metrics
-            where metric = ?
+            where metric = any(?)
             group by metric
             """,
-            (metric,),
-        ).fetchone()
-    if result is None:
-        return {"metric": metric, "records": 0, "average": None, "last_seen": None}
-    return {
-        "metric": result[0],
-        "records": int(result[1]),
-        "average": float(result[2]),
-        "last_seen": result[3].isoformat() if result[3] else None,
-    }
+            (metrics,),
+        ).fetchall()
+    by_metric = {row[0]: row for row in rows}
+    return [_summarize(metric, by_metric.get(metric)) for metric in metrics]
+
+
+@celery_app.task(name="reports.generate_summary")
+def generate_summary(metric: str) -> Dict[str, Any]:
+    """Compute basic aggregates for a metric stored in DuckDB."""
+
+    return _summaries([metric])[0]
+
+
+@celery_app.task(name="reports.generate_summaries")
+def generate_summaries(metrics: List[str]) -> List[Dict[str, Any]]:
+    """Compute aggregates for several metrics in a single DuckDB query."""
+
+    return _summaries(metrics)